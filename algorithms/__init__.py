@@ -2,4 +2,5 @@
 from .tsp import calculate_tsp_route  # Updated import
 from .mst import calculate_mst_prim, calculate_mst_kruskal
 from .multistage import calculate_multistage_route
-from .utility import haversine_distance, get_route_from_osrm
\ No newline at end of file
+from .utility import haversine_distance, get_route_from_osrm
+from .engine import ALGORITHMS, calculate_route, register_backend
@@ -0,0 +1,212 @@
+import functools
+from collections import namedtuple
+import networkx as nx
+from algorithms.utility import haversine_distance, get_route_from_osrm
+from algorithms.speed_profile import speed_profile
+
+AMBULANCE_NODE = 'ambulance'
+
+def hospital_node(index):
+    """Graph node name for the hospital at the given index"""
+    return f"hospital_{index}"
+
+# ---------------------------------------------------------------------------
+# Weighting models: turn the ambulance-to-hospital distance into an edge weight
+# ---------------------------------------------------------------------------
+
+def priority_weight(distance, hospital, emergency_level):
+    """Weight by hospital priority for the emergency level, penalising low capacity"""
+    weight = distance
+
+    if emergency_level == 'high':
+        # For high emergency, prioritize hospitals with high priority
+        weight = weight / (hospital['priority'] + 0.5)
+    elif emergency_level == 'medium':
+        # For medium emergency, slightly prioritize hospitals with higher priority
+        weight = weight / (hospital['priority'] * 0.3 + 0.7)
+
+    # Consider capacity
+    if hospital['capacity'] < 30:  # Low capacity
+        weight *= 1.2
+
+    return weight
+
+def adjust_weight(distance, hospital, emergency_level):
+    """Adjust weight based on hospital priority, capacity and emergency level"""
+    weight = priority_weight(distance, hospital, emergency_level)
+
+    # Also penalise medium capacity
+    if 30 <= hospital['capacity'] < 50:
+        weight *= 1.1
+
+    return weight
+
+def suitability_weight(distance, hospital, emergency_level):
+    """Hospital suitability cost from capacity and priority (independent of distance)"""
+    capacity_weight = 0
+    if hospital['capacity'] < 30:
+        capacity_weight = 3  # High penalty for low capacity
+    elif hospital['capacity'] < 60:
+        capacity_weight = 1  # Medium penalty for medium capacity
+
+    # Priority cost (inverse of priority - lower is better)
+    priority_cost = (5 - hospital['priority']) * 2
+
+    # Adjust weights based on emergency level
+    if emergency_level == 'high':
+        priority_cost *= 2  # Priority is more important for high emergency
+    elif emergency_level == 'low':
+        capacity_weight *= 0.5  # Capacity is less important for low emergency
+
+    return capacity_weight + priority_cost
+
+WEIGHTING_MODELS = {
+    'priority': priority_weight,
+    'priority_capacity': adjust_weight,
+    'suitability': suitability_weight,
+}
+
+# ---------------------------------------------------------------------------
+# Candidate generation: distances and weights computed once per request
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=16)
+def _distance_matrix(coordinates):
+    return tuple(
+        tuple(haversine_distance(lat1, lng1, lat2, lng2) for lat2, lng2 in coordinates)
+        for lat1, lng1 in coordinates
+    )
+
+def hospital_distance_matrix(hospitals):
+    """Pairwise hospital distances, cached since the hospital list rarely changes"""
+    return _distance_matrix(tuple((h['lat'], h['lng']) for h in hospitals))
+
+class Candidates:
+    """Hospitals to choose from, with their distances and weights from the ambulance
+
+    travel_distances scale the straight-line distances by the congestion expected
+    at the departure time (see speed_profile), so selection reflects rush hour.
+    """
+
+    def __init__(self, ambulance_loc, hospitals, emergency_level, weighting, departure=None):
+        self.ambulance_loc = ambulance_loc
+        self.hospitals = hospitals
+        self.emergency_level = emergency_level
+        self.distances = [
+            haversine_distance(ambulance_loc['lat'], ambulance_loc['lng'], h['lat'], h['lng'])
+            for h in hospitals
+        ]
+        self.travel_distances = [
+            distance * speed_profile.congestion_factor(
+                ambulance_loc['lat'], ambulance_loc['lng'], h['lat'], h['lng'], departure
+            )
+            for distance, h in zip(self.distances, hospitals)
+        ]
+        self.weights = [
+            weighting(distance, hospital, emergency_level)
+            for distance, hospital in zip(self.travel_distances, hospitals)
+        ]
+        self.hospital_distances = hospital_distance_matrix(hospitals)
+        self._graph = None
+
+    def __len__(self):
+        return len(self.hospitals)
+
+    def graph(self):
+        """Complete networkx graph of the ambulance and hospitals, built on first use"""
+        if self._graph is None:
+            G = nx.Graph()
+            G.add_node(AMBULANCE_NODE, pos=(self.ambulance_loc['lat'], self.ambulance_loc['lng']))
+
+            for i, hospital in enumerate(self.hospitals):
+                G.add_node(hospital_node(i), pos=(hospital['lat'], hospital['lng']),
+                           priority=hospital['priority'], capacity=hospital['capacity'])
+                G.add_edge(AMBULANCE_NODE, hospital_node(i), weight=self.weights[i])
+
+            # Add edges between hospitals (fully connected graph)
+            for i in range(len(self.hospitals)):
+                for j in range(i + 1, len(self.hospitals)):
+                    G.add_edge(hospital_node(i), hospital_node(j),
+                               weight=self.hospital_distances[i][j])
+
+            self._graph = G
+        return self._graph
+
+    def weight_matrix(self):
+        """Dense weight matrix with the ambulance at index 0 and hospital i at i + 1"""
+        size = len(self.hospitals) + 1
+        matrix = [[0.0] * size for _ in range(size)]
+        for i, weight in enumerate(self.weights):
+            matrix[0][i + 1] = weight
+            matrix[i + 1][0] = weight
+        for i, row in enumerate(self.hospital_distances):
+            for j, distance in enumerate(row):
+                matrix[i + 1][j + 1] = distance
+        return matrix
+
+def argmin(values):
+    """Index of the smallest value"""
+    return min(range(len(values)), key=values.__getitem__)
+
+# ---------------------------------------------------------------------------
+# Algorithm registry
+# ---------------------------------------------------------------------------
+
+Backend = namedtuple('Backend', ['name', 'label', 'backend', 'weighting', 'select',
+                                 'fallback', 'fallback_label'])
+
+ALGORITHMS = {}
+
+def closest_by_distance(candidates):
+    """Fallback selection: the hospital closest by congestion-adjusted distance"""
+    return argmin(candidates.travel_distances)
+
+def register_backend(name, label, backend='networkx', weighting='priority',
+                     fallback=closest_by_distance, fallback_label='Direct distance (fallback)'):
+    """Register a selection step under an algorithm name
+
+    The selection step receives a Candidates object and returns the index of
+    the chosen hospital, or None to use the fallback selection instead.
+    """
+    def decorator(select):
+        ALGORITHMS[name] = Backend(name, label, backend, weighting, select,
+                                   fallback, fallback_label)
+        return select
+    return decorator
+
+def get_backend(algorithm):
+    """Look up a registered algorithm by name"""
+    try:
+        return ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+def resolve_route(ambulance_loc, hospital, label, departure=None):
+    """Get the actual road route to the chosen hospital and build the API result"""
+    route = get_route_from_osrm(
+        ambulance_loc['lat'], ambulance_loc['lng'],
+        hospital['lat'], hospital['lng'],
+        departure
+    )
+
+    return {
+        'hospital': hospital,
+        'distance': route['distance'],
+        'duration': route['duration'],
+        'route': route['geometry'],
+        'algorithm': label
+    }
+
+def calculate_route(ambulance_loc, hospitals, emergency_level, algorithm='tsp', departure=None):
+    """Select the best hospital with a registered algorithm and resolve its route"""
+    backend = get_backend(algorithm)
+    candidates = Candidates(ambulance_loc, hospitals, emergency_level,
+                            WEIGHTING_MODELS[backend.weighting], departure)
+
+    index = backend.select(candidates)
+    label = backend.label
+    if index is None:
+        index = backend.fallback(candidates)
+        label = backend.fallback_label
+
+    return resolve_route(ambulance_loc, hospitals[index], label, departure)
@@ -1,157 +1,100 @@
 import networkx as nx
-import math
-import requests
-from algorithms.utility import haversine_distance, get_route_from_osrm
+from algorithms.engine import (
+    AMBULANCE_NODE, Candidates, WEIGHTING_MODELS, register_backend, calculate_route
+)
 
 def create_graph_with_weights(ambulance_loc, hospitals, emergency_level):
     """Create a weighted graph based on locations and emergency level"""
-    G = nx.Graph()
-    
-    # Add ambulance node
-    ambulance_node = 'ambulance'
-    G.add_node(ambulance_node, pos=(ambulance_loc['lat'], ambulance_loc['lng']))
-    
-    # Add hospital nodes with appropriate weights
-    for i, hospital in enumerate(hospitals):
-        hospital_id = f"hospital_{i}"
-        G.add_node(hospital_id, pos=(hospital['lat'], hospital['lng']), 
-                  priority=hospital['priority'], capacity=hospital['capacity'])
-        
-        # Calculate distance between ambulance and hospital
-        distance = haversine_distance(
-            ambulance_loc['lat'], ambulance_loc['lng'],
-            hospital['lat'], hospital['lng']
-        )
-        
-        # Adjust weight based on emergency level
-        weight = distance
-        if emergency_level == 'high':
-            weight = weight / (hospital['priority'] + 0.5)
-        elif emergency_level == 'medium':
-            weight = weight / (hospital['priority'] * 0.3 + 0.7)
-            
-        # Adjust for capacity
-        if hospital['capacity'] < 30:
-            weight *= 1.2
-            
-        G.add_edge(ambulance_node, hospital_id, weight=weight)
-    
-    # Add edges between hospitals (fully connected graph)
-    for i, hospital1 in enumerate(hospitals):
-        for j, hospital2 in enumerate(hospitals):
-            if i < j:  # Avoid duplicate edges
-                hospital1_id = f"hospital_{i}"
-                hospital2_id = f"hospital_{j}"
-                
-                # Calculate distance between hospitals
-                distance = haversine_distance(
-                    hospital1['lat'], hospital1['lng'],
-                    hospital2['lat'], hospital2['lng']
-                )
-                
-                G.add_edge(hospital1_id, hospital2_id, weight=distance)
-    
-    return G
+    return Candidates(ambulance_loc, hospitals, emergency_level,
+                      WEIGHTING_MODELS['priority']).graph()
+
+def select_from_mst(mst):
+    """Pick the hospital joined to the ambulance by the lightest MST edge"""
+    connected_hospitals = list(mst.neighbors(AMBULANCE_NODE))
 
-def calculate_mst_prim(ambulance_loc, hospitals, emergency_level):
-    """Calculate MST using Prim's algorithm and select best hospital"""
-    G = create_graph_with_weights(ambulance_loc, hospitals, emergency_level)
-    
-    # Calculate MST using Prim's algorithm
-    mst = nx.minimum_spanning_tree(G, algorithm='prim')
-    
-    # Find the closest hospital in the MST
-    ambulance_node = 'ambulance'
-    connected_hospitals = list(mst.neighbors(ambulance_node))
-    
     if not connected_hospitals:
         # Fallback if no hospital is connected directly in MST
-        return calculate_fallback_route(ambulance_loc, hospitals, emergency_level)
-    
-    # Find the hospital with the smallest weight (distance)
+        return None
+
     best_hospital_id = min(
         connected_hospitals,
-        key=lambda x: mst[ambulance_node][x]['weight']
+        key=lambda x: mst[AMBULANCE_NODE][x]['weight']
     )
-    
-    # Get the index of the best hospital
-    best_hospital_index = int(best_hospital_id.split('_')[1])
-    best_hospital = hospitals[best_hospital_index]
-    
-    # Get the actual route using OSRM
-    route = get_route_from_osrm(
-        ambulance_loc['lat'], ambulance_loc['lng'],
-        best_hospital['lat'], best_hospital['lng']
-    )
-    
-    return {
-        'hospital': best_hospital,
-        'distance': route['distance'],
-        'duration': route['duration'],
-        'route': route['geometry'],
-        'algorithm': 'Prim\'s MST'
-    }
+    return int(best_hospital_id.split('_')[1])
+
+@register_backend('prim', 'Prim\'s MST')
+def select_prim_networkx(candidates):
+    """Select the best hospital from a networkx MST built with Prim's algorithm"""
+    return select_from_mst(nx.minimum_spanning_tree(candidates.graph(), algorithm='prim'))
+
+@register_backend('kruskal', 'Kruskal\'s MST')
+def select_kruskal_networkx(candidates):
+    """Select the best hospital from a networkx MST built with Kruskal's algorithm"""
+    return select_from_mst(nx.minimum_spanning_tree(candidates.graph(), algorithm='kruskal'))
+
+def select_from_tree_edges(edges):
+    """Pick the hospital joined to the ambulance (index 0) by the lightest tree edge"""
+    ambulance_edges = [(weight, v if u == 0 else u) for weight, u, v in edges if 0 in (u, v)]
+
+    if not ambulance_edges:
+        return None
+
+    # The hospital at matrix index k is hospitals[k - 1]
+    _, node = min(ambulance_edges)
+    return node - 1
+
+@register_backend('prim_array', 'Prim\'s MST (array)', backend='array')
+def select_prim_array(candidates):
+    """Dense O(n^2) Prim's algorithm over the weight matrix, starting at the ambulance"""
+    matrix = candidates.weight_matrix()
+    size = len(matrix)
+    in_tree = [False] * size
+    best = [float('inf')] * size
+    parent = [-1] * size
+    best[0] = 0.0
+    edges = []
+
+    for _ in range(size):
+        u = min((i for i in range(size) if not in_tree[i]), key=best.__getitem__)
+        in_tree[u] = True
+        if parent[u] >= 0:
+            edges.append((best[u], parent[u], u))
+        for v in range(size):
+            if not in_tree[v] and matrix[u][v] < best[v]:
+                best[v] = matrix[u][v]
+                parent[v] = u
+
+    return select_from_tree_edges(edges)
+
+@register_backend('kruskal_array', 'Kruskal\'s MST (array)', backend='array')
+def select_kruskal_array(candidates):
+    """Kruskal's algorithm over a sorted edge list with a union-find array"""
+    matrix = candidates.weight_matrix()
+    size = len(matrix)
+    root = list(range(size))
+
+    def find(x):
+        while root[x] != x:
+            root[x] = root[root[x]]
+            x = root[x]
+        return x
+
+    edges = []
+    for weight, u, v in sorted((matrix[u][v], u, v)
+                               for u in range(size) for v in range(u + 1, size)):
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            root[ru] = rv
+            edges.append((weight, u, v))
+            if len(edges) == size - 1:
+                break
+
+    return select_from_tree_edges(edges)
+
+def calculate_mst_prim(ambulance_loc, hospitals, emergency_level):
+    """Calculate MST using Prim's algorithm and select best hospital"""
+    return calculate_route(ambulance_loc, hospitals, emergency_level, 'prim')
 
 def calculate_mst_kruskal(ambulance_loc, hospitals, emergency_level):
     """Calculate MST using Kruskal's algorithm and select best hospital"""
-    G = create_graph_with_weights(ambulance_loc, hospitals, emergency_level)
-    
-    # Calculate MST using Kruskal's algorithm
-    mst = nx.minimum_spanning_tree(G, algorithm='kruskal')
-    
-    # Find the closest hospital in the MST
-    ambulance_node = 'ambulance'
-    connected_hospitals = list(mst.neighbors(ambulance_node))
-    
-    if not connected_hospitals:
-        # Fallback if no hospital is connected directly in MST
-        return calculate_fallback_route(ambulance_loc, hospitals, emergency_level)
-    
-    # Find the hospital with the smallest weight (distance)
-    best_hospital_id = min(
-        connected_hospitals,
-        key=lambda x: mst[ambulance_node][x]['weight']
-    )
-    
-    # Get the index of the best hospital
-    best_hospital_index = int(best_hospital_id.split('_')[1])
-    best_hospital = hospitals[best_hospital_index]
-    
-    # Get the actual route using OSRM
-    route = get_route_from_osrm(
-        ambulance_loc['lat'], ambulance_loc['lng'],
-        best_hospital['lat'], best_hospital['lng']
-    )
-    
-    return {
-        'hospital': best_hospital,
-        'distance': route['distance'],
-        'duration': route['duration'],
-        'route': route['geometry'],
-        'algorithm': 'Kruskal\'s MST'
-    }
-
-def calculate_fallback_route(ambulance_loc, hospitals, emergency_level):
-    """Fallback method if MST doesn't have direct connection to ambulance"""
-    # Find the closest hospital by straight-line distance
-    closest_hospital = min(
-        hospitals,
-        key=lambda h: haversine_distance(
-            ambulance_loc['lat'], ambulance_loc['lng'],
-            h['lat'], h['lng']
-        )
-    )
-    
-    # Get the actual route using OSRM
-    route = get_route_from_osrm(
-        ambulance_loc['lat'], ambulance_loc['lng'],
-        closest_hospital['lat'], closest_hospital['lng']
-    )
-    
-    return {
-        'hospital': closest_hospital,
-        'distance': route['distance'],
-        'duration': route['duration'],
-        'route': route['geometry'],
-        'algorithm': 'Direct distance (fallback)'
-    }
\ No newline at end of file
+    return calculate_route(ambulance_loc, hospitals, emergency_level, 'kruskal')
@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Location of the on-disk route store and the maximum number of routes kept in it
+ROUTE_STORE_PATH = os.environ.get('ROUTE_STORE_PATH', 'data/route_store.sqlite3')
+ROUTE_STORE_MAX_ENTRIES = int(os.environ.get('ROUTE_STORE_MAX_ENTRIES', '5000'))
+
+# Bump this whenever the OSRM profile or server changes so old routes are ignored
+ROUTING_PROFILE_VERSION = 'osrm-driving-v1'
+
+# A stored route's last_used time is only refreshed on a hit when older than this,
+# so cache hits are plain reads instead of a disk write each time
+TOUCH_INTERVAL_SECONDS = 300
+
+# Coordinates are snapped to 4 decimal places (~11 m) before being used as a key
+SNAP_PRECISION = 4
+
+def snap_coordinate(value):
+    """Snap a latitude or longitude so nearby points share a store entry"""
+    return round(float(value), SNAP_PRECISION)
+
+class RouteStore:
+    """Durable SQLite store for OSRM route results with size-based eviction"""
+
+    def __init__(self, path=ROUTE_STORE_PATH, max_entries=ROUTE_STORE_MAX_ENTRIES,
+                 profile_version=ROUTING_PROFILE_VERSION):
+        self.path = path
+        self.max_entries = max_entries
+        self.profile_version = profile_version
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        """Open the database on first use and create the table if needed"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL with synchronous=NORMAL avoids an fsync on every commit
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS routes ('
+                ' origin_lat REAL, origin_lng REAL,'
+                ' dest_lat REAL, dest_lng REAL,'
+                ' profile TEXT,'
+                ' distance REAL, duration REAL, geometry TEXT,'
+                ' last_used REAL,'
+                ' PRIMARY KEY (origin_lat, origin_lng, dest_lat, dest_lng, profile))'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS routes_last_used ON routes (last_used)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _key(self, lat1, lon1, lat2, lon2):
+        return (snap_coordinate(lat1), snap_coordinate(lon1),
+                snap_coordinate(lat2), snap_coordinate(lon2),
+                self.profile_version)
+
+    def get(self, lat1, lon1, lat2, lon2):
+        """Return the stored route between two points, or None if not stored"""
+        key = self._key(lat1, lon1, lat2, lon2)
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    'SELECT distance, duration, geometry, last_used FROM routes'
+                    ' WHERE origin_lat = ? AND origin_lng = ? AND dest_lat = ?'
+                    ' AND dest_lng = ? AND profile = ?',
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[3] > TOUCH_INTERVAL_SECONDS:
+                    conn.execute(
+                        'UPDATE routes SET last_used = ?'
+                        ' WHERE origin_lat = ? AND origin_lng = ? AND dest_lat = ?'
+                        ' AND dest_lng = ? AND profile = ?',
+                        (now,) + key
+                    )
+                    conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error reading route store: {e}")
+            return None
+
+        return {
+            'distance': row[0],
+            'duration': row[1],
+            'geometry': json.loads(row[2])
+        }
+
+    def put(self, lat1, lon1, lat2, lon2, route):
+        """Store a route and evict the least recently used entries over the limit"""
+        key = self._key(lat1, lon1, lat2, lon2)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    'INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    key + (route['distance'], route['duration'],
+                           json.dumps(route['geometry']), time.time())
+                )
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing route store: {e}")
+
+    def _evict(self, conn):
+        """Delete the least recently used routes beyond max_entries"""
+        count = conn.execute('SELECT COUNT(*) FROM routes').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM routes WHERE rowid IN'
+                ' (SELECT rowid FROM routes ORDER BY last_used ASC LIMIT ?)',
+                (excess,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM routes').fetchone()[0]
+
+# Shared store used by get_route_from_osrm
+route_store = RouteStore()
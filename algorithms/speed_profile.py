@@ -0,0 +1,159 @@
+import json
+import math
+import os
+import threading
+from array import array
+from datetime import datetime
+
+# Location of the historical speed profile file and how often it is re-read
+SPEED_PROFILE_PATH = os.environ.get('SPEED_PROFILE_PATH', 'data/speed_profiles.json')
+SPEED_PROFILE_REFRESH_SECONDS = int(os.environ.get('SPEED_PROFILE_REFRESH_SECONDS', '300'))
+
+# Speed assumed when no profile covers a trip (matches the old "distance * 2 minutes" estimate)
+DEFAULT_SPEED_KMH = 30.0
+
+# Profiles are given per 15-minute time-of-day bucket
+BUCKET_MINUTES = 15
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+# Default size of an area cell in degrees (~1.1 km)
+DEFAULT_CELL_SIZE = 0.01
+
+def time_bucket(when=None):
+    """Index of the 15-minute time-of-day bucket for a datetime (default: now)
+
+    Profiles are in the server's local time, so timezone-aware datetimes are
+    converted to local time first. Naive datetimes are taken as local time.
+    """
+    when = when or datetime.now()
+    if when.tzinfo is not None:
+        when = when.astimezone()
+    return (when.hour * 60 + when.minute) // BUCKET_MINUTES
+
+def cell_key(lat, lng, cell_size):
+    """Key of the area cell containing a point
+
+    Cells are aligned to multiples of cell_size, so a cell declared at a
+    multiple (e.g. 11.0, 76.96) covers that corner up to the next multiple.
+    The division is rounded first so float error (11.0 / 0.01 = 1099.999...)
+    does not push a point into the neighbouring cell.
+    """
+    return (math.floor(round(lat / cell_size, 6)), math.floor(round(lng / cell_size, 6)))
+
+class SpeedProfile:
+    """Historical speeds per area cell and 15-minute time bucket
+
+    Speeds (km/h) are kept in flat float arrays with BUCKETS_PER_DAY entries
+    per cell, so lookups need no network calls. The file format is:
+
+        {
+            "cell_size": 0.01,
+            "cells": [{"lat": 11.01, "lng": 76.96, "speeds": [96 values]}, ...],
+            "default": [96 values]
+        }
+
+    Each cell's lat/lng is its south-west corner. "default" is a global
+    time-of-day profile used where no cell covers a point. Both "cells" and
+    "default" are optional.
+    """
+
+    def __init__(self):
+        # (cell_size, cell index, cell speeds, default speeds)
+        self._tables = (DEFAULT_CELL_SIZE, {}, array('f'), None)
+        self._mtime = None
+
+    def load(self, path=SPEED_PROFILE_PATH):
+        """Load profiles from a JSON file, keeping the current tables if it is missing or invalid"""
+        try:
+            if not os.path.exists(path):
+                return False
+
+            self._mtime = os.path.getmtime(path)
+            with open(path, 'r') as f:
+                data = json.load(f)
+
+            cell_size = float(data.get('cell_size', DEFAULT_CELL_SIZE))
+            cell_index, cell_speeds = {}, array('f')
+            for cell in data.get('cells', []):
+                key = cell_key(cell['lat'], cell['lng'], cell_size)
+                if key in cell_index:
+                    raise ValueError(f"More than one profile for the cell at {cell['lat']}, {cell['lng']}")
+                cell_index[key] = len(cell_index)
+                cell_speeds.extend(self._validate(cell['speeds']))
+
+            default_speeds = None
+            if 'default' in data:
+                default_speeds = array('f', self._validate(data['default']))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Error loading speed profiles from {path}: {e}")
+            return False
+
+        # Swap in the new tables with a single assignment so readers never see a mix
+        self._tables = (cell_size, cell_index, cell_speeds, default_speeds)
+        return True
+
+    def refresh(self, path=SPEED_PROFILE_PATH):
+        """Reload the profiles if the file changed since the last load"""
+        if os.path.exists(path) and os.path.getmtime(path) != self._mtime:
+            return self.load(path)
+        return False
+
+    @staticmethod
+    def _validate(speeds):
+        if not isinstance(speeds, list) or len(speeds) != BUCKETS_PER_DAY:
+            raise ValueError(f"Expected a list of {BUCKETS_PER_DAY} speeds per profile")
+        if min(speeds) <= 0:
+            raise ValueError("Speeds must be positive")
+        return speeds
+
+    def speed(self, lat1, lon1, lat2, lon2, when=None):
+        """Expected speed in km/h for a trip through the cells it starts, passes and ends in
+
+        Cells without a profile use the default profile, then DEFAULT_SPEED_KMH.
+        The trip is treated as three equal legs, so the speeds are combined with
+        a harmonic mean (equivalent to adding up the travel time of each leg).
+        """
+        cell_size, cell_index, cell_speeds, default_speeds = self._tables
+        bucket = time_bucket(when)
+
+        base_speed = DEFAULT_SPEED_KMH
+        if default_speeds is not None:
+            base_speed = default_speeds[bucket]
+
+        if not cell_index:
+            return base_speed
+
+        samples = []
+        for lat, lng in ((lat1, lon1), ((lat1 + lat2) / 2, (lon1 + lon2) / 2), (lat2, lon2)):
+            row = cell_index.get(cell_key(lat, lng, cell_size))
+            samples.append(base_speed if row is None else cell_speeds[row * BUCKETS_PER_DAY + bucket])
+
+        return len(samples) / sum(1 / speed for speed in samples)
+
+    def duration(self, distance, lat1, lon1, lat2, lon2, when=None):
+        """Estimated travel time in minutes for a trip of the given length in km"""
+        return distance / self.speed(lat1, lon1, lat2, lon2, when) * 60
+
+    def congestion_factor(self, lat1, lon1, lat2, lon2, when=None):
+        """How much slower than DEFAULT_SPEED_KMH the trip is (1.0 without profiles)"""
+        return DEFAULT_SPEED_KMH / self.speed(lat1, lon1, lat2, lon2, when)
+
+def start_profile_refresh(profile, path=SPEED_PROFILE_PATH,
+                          interval=SPEED_PROFILE_REFRESH_SECONDS):
+    """Re-read the profile file in a background thread whenever it changes"""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                profile.refresh(path)
+            except Exception as e:
+                # Keep the thread alive so later fixes to the file are picked up
+                print(f"Error refreshing speed profiles: {e}")
+
+    thread = threading.Thread(target=run, name='speed-profile-refresh', daemon=True)
+    thread.start()
+    return stop
+
+# Shared profile used for hospital selection and fallback ETAs
+speed_profile = SpeedProfile()
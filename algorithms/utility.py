@@ -1,6 +1,9 @@
 # utility.py - Put this in your algorithms folder
 import math
+import threading
 import requests
+from algorithms.route_store import route_store
+from algorithms.speed_profile import speed_profile
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """Calculate the great circle distance between two points on earth"""
@@ -15,39 +18,84 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     r = 6371  # Radius of earth in kilometers
     return c * r
 
-def get_route_from_osrm(lat1, lon1, lat2, lon2):
-    """Get route information from OSRM service"""
+def get_route_from_osrm(lat1, lon1, lat2, lon2, departure=None):
+    """Get route information from OSRM service, using the on-disk route store first
+
+    departure only affects the straight-line fallback ETA (default: now)
+    """
+    stored_route = route_store.get(lat1, lon1, lat2, lon2)
+    if stored_route is not None:
+        return stored_route
+    
     base_url = "http://router.project-osrm.org/route/v1/driving/"
     url = f"{base_url}{lon1},{lat1};{lon2},{lat2}?overview=full&geometries=geojson"
     
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=5)
         data = response.json()
         
         if data["code"] == "Ok":
             route = data["routes"][0]
-            return {
+            result = {
                 "distance": route["distance"] / 1000,  # Convert to km
                 "duration": route["duration"] / 60,    # Convert to minutes
                 "geometry": route["geometry"]
             }
+            # Only real OSRM routes are stored; fallbacks are retried next time
+            route_store.put(lat1, lon1, lat2, lon2, result)
+            return result
         else:
             # Fallback if OSRM fails
-            return {
-                "distance": haversine_distance(lat1, lon1, lat2, lon2),
-                "duration": haversine_distance(lat1, lon1, lat2, lon2) * 2,  # Rough estimate
-                "geometry": {
-                    "type": "LineString",
-                    "coordinates": [[lon1, lat1], [lon2, lat2]]
-                }
-            }
+            return get_fallback_route(lat1, lon1, lat2, lon2, departure)
     except Exception as e:
         # Fallback in case of network issues
-        return {
-            "distance": haversine_distance(lat1, lon1, lat2, lon2),
-            "duration": haversine_distance(lat1, lon1, lat2, lon2) * 2,  # Rough estimate
-            "geometry": {
-                "type": "LineString",
-                "coordinates": [[lon1, lat1], [lon2, lat2]]
-            }
-        }
\ No newline at end of file
+        return get_fallback_route(lat1, lon1, lat2, lon2, departure)
+
+def get_fallback_route(lat1, lon1, lat2, lon2, departure=None):
+    """Straight-line route with an ETA from the historical speed profiles"""
+    distance = haversine_distance(lat1, lon1, lat2, lon2)
+    return {
+        "distance": distance,
+        "duration": speed_profile.duration(distance, lat1, lon1, lat2, lon2, departure),
+        "geometry": {
+            "type": "LineString",
+            "coordinates": [[lon1, lat1], [lon2, lat2]]
+        }
+    }
+
+def warm_up_routes(hospitals, stations):
+    """Pre-populate the route store with station-to-hospital and hospital transfer routes"""
+    pairs = []
+    for station in stations:
+        for hospital in hospitals:
+            pairs.append((station, hospital))
+    for hospital1 in hospitals:
+        for hospital2 in hospitals:
+            if hospital1 is not hospital2:
+                pairs.append((hospital1, hospital2))
+    
+    for origin, destination in pairs:
+        get_route_from_osrm(
+            origin['lat'], origin['lng'],
+            destination['lat'], destination['lng']
+        )
+
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+
+def start_route_warm_up(hospitals, stations):
+    """Run warm_up_routes in a background thread so startup is not blocked
+
+    Only the first call in a process starts a thread; later calls return it.
+    """
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(
+                target=warm_up_routes,
+                args=(hospitals, stations),
+                name='route-warm-up',
+                daemon=True
+            )
+            _warm_up_thread.start()
+        return _warm_up_thread
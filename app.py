@@ -1,9 +1,13 @@
 from flask import Flask, render_template, request, jsonify
 import json
 import os
+from datetime import datetime
 from algorithms.tsp import calculate_tsp_route  # Updated import
 from algorithms.mst import calculate_mst_prim, calculate_mst_kruskal
 from algorithms.multistage import calculate_multistage_route
+from algorithms.engine import ALGORITHMS, calculate_route
+from algorithms.utility import start_route_warm_up
+from algorithms.speed_profile import speed_profile, start_profile_refresh
 
 app = Flask(__name__)
 
@@ -11,6 +15,21 @@ app = Flask(__name__)
 with open('data/hospitals.json', 'r') as f:
     hospitals = json.load(f)
 
+# Load ambulance station data (optional, same format as hospitals.json)
+stations = []
+if os.path.exists('data/stations.json'):
+    with open('data/stations.json', 'r') as f:
+        stations = json.load(f)
+
+# Load historical speed profiles (optional) and keep them refreshed in the background
+speed_profile.load()
+start_profile_refresh(speed_profile)
+
+# Pre-populate the route store in the background so startup is not blocked.
+# This runs at import so it also happens under `flask run` and WSGI servers;
+# each process starts the warm-up at most once.
+start_route_warm_up(hospitals, stations)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -19,6 +38,33 @@ def index():
 def get_hospitals():
     return jsonify(hospitals)
 
+@app.route('/api/algorithms', methods=['GET'])
+def get_algorithms():
+    return jsonify({
+        name: {'label': backend.label, 'backend': backend.backend}
+        for name, backend in ALGORITHMS.items()
+    })
+
+@app.route('/api/route', methods=['POST'])
+def route():
+    data = request.get_json()
+    ambulance_loc = data['ambulance']
+    emergency_level = data['emergency_level']
+    algorithm = data.get('algorithm', 'tsp')
+    departure = data.get('departure')  # Optional ISO time, defaults to now
+    
+    if algorithm not in ALGORITHMS:
+        return jsonify({'error': f"Unknown algorithm: {algorithm}"}), 400
+    
+    if departure:
+        try:
+            departure = datetime.fromisoformat(departure)
+        except (TypeError, ValueError):
+            return jsonify({'error': f"Invalid departure time: {departure}"}), 400
+    
+    result = calculate_route(ambulance_loc, hospitals, emergency_level, algorithm, departure)
+    return jsonify(result)
+
 @app.route('/api/tsp', methods=['POST'])  # Updated route
 def tsp():  # Updated function name
     data = request.get_json()
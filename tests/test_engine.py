@@ -0,0 +1,43 @@
+import json
+import os
+import random
+
+import pytest
+
+import algorithms.engine as engine
+from algorithms import ALGORITHMS, calculate_route
+
+with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'hospitals.json'), 'r') as f:
+    HOSPITALS = json.load(f)
+
+ARRAY_BACKENDS = sorted(name for name in ALGORITHMS if name.endswith('_array'))
+
+def ambulance_positions(count=100, seed=1):
+    rng = random.Random(seed)
+    return [{'lat': 11.0 + rng.uniform(-0.1, 0.1), 'lng': 77.0 + rng.uniform(-0.1, 0.1)}
+            for _ in range(count)]
+
+@pytest.fixture(autouse=True)
+def offline_osrm(monkeypatch):
+    def straight_line(lat1, lon1, lat2, lon2, departure=None):
+        return {'distance': 0.0, 'duration': 0.0, 'geometry': None}
+
+    monkeypatch.setattr(engine, 'get_route_from_osrm', straight_line)
+
+def test_every_networkx_backend_has_an_array_counterpart():
+    networkx_backends = {name for name, backend in ALGORITHMS.items()
+                         if backend.backend == 'networkx'}
+    assert {name[:-len('_array')] for name in ARRAY_BACKENDS} == networkx_backends
+
+@pytest.mark.parametrize('array_name', ARRAY_BACKENDS)
+@pytest.mark.parametrize('emergency_level', ['low', 'medium', 'high'])
+def test_array_backend_matches_networkx(array_name, emergency_level):
+    networkx_name = array_name[:-len('_array')]
+    for ambulance in ambulance_positions():
+        expected = calculate_route(ambulance, HOSPITALS, emergency_level, networkx_name)
+        actual = calculate_route(ambulance, HOSPITALS, emergency_level, array_name)
+        assert actual['hospital'] is expected['hospital']
+
+def test_unknown_algorithm_raises():
+    with pytest.raises(ValueError):
+        calculate_route({'lat': 11.0, 'lng': 77.0}, HOSPITALS, 'high', 'dijkstra')
@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+import algorithms.route_store as route_store_module
+import algorithms.utility as utility
+from algorithms.route_store import RouteStore
+
+def make_route(distance):
+    return {
+        'distance': distance,
+        'duration': distance * 2,
+        'geometry': {'type': 'LineString', 'coordinates': [[76.96, 11.0], [77.0, 11.02]]}
+    }
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'routes.sqlite3')
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make time.time() in the route store advance by a second on every call"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(route_store_module.time, 'time', lambda: float(next(ticks)))
+
+def test_get_returns_stored_route(store_path):
+    store = RouteStore(store_path)
+    store.put(11.0, 76.96, 11.02, 77.0, make_route(3.5))
+    assert store.get(11.0, 76.96, 11.02, 77.0) == make_route(3.5)
+    assert store.get(11.02, 77.0, 11.0, 76.96) is None
+
+def test_nearby_points_share_snapped_key(store_path):
+    store = RouteStore(store_path)
+    store.put(11.00001, 76.96004, 11.02, 77.0, make_route(3.5))
+    assert store.get(11.00003, 76.95996, 11.02, 77.0) == make_route(3.5)
+    assert store.get(11.0002, 76.96, 11.02, 77.0) is None
+
+def test_profile_version_change_ignores_old_routes(store_path):
+    RouteStore(store_path, profile_version='v1').put(11.0, 76.96, 11.02, 77.0, make_route(3.5))
+    assert RouteStore(store_path, profile_version='v2').get(11.0, 76.96, 11.02, 77.0) is None
+    assert RouteStore(store_path, profile_version='v1').get(11.0, 76.96, 11.02, 77.0) is not None
+
+def test_routes_survive_reopening(store_path):
+    RouteStore(store_path).put(11.0, 76.96, 11.02, 77.0, make_route(3.5))
+    assert RouteStore(store_path).get(11.0, 76.96, 11.02, 77.0) == make_route(3.5)
+
+def test_least_recently_used_routes_are_evicted(store_path, clock, monkeypatch):
+    monkeypatch.setattr(route_store_module, 'TOUCH_INTERVAL_SECONDS', 0)
+    store = RouteStore(store_path, max_entries=2)
+    store.put(11.0, 76.96, 11.01, 77.0, make_route(1))
+    store.put(11.0, 76.96, 11.02, 77.0, make_route(2))
+
+    # Reading the first route makes the second one the least recently used
+    assert store.get(11.0, 76.96, 11.01, 77.0) is not None
+    store.put(11.0, 76.96, 11.03, 77.0, make_route(3))
+
+    assert len(store) == 2
+    assert store.get(11.0, 76.96, 11.01, 77.0) is not None
+    assert store.get(11.0, 76.96, 11.02, 77.0) is None
+    assert store.get(11.0, 76.96, 11.03, 77.0) is not None
+
+def test_fallback_routes_are_not_stored(store_path, monkeypatch):
+    def offline(*args, **kwargs):
+        raise utility.requests.ConnectionError('offline')
+
+    store = RouteStore(store_path)
+    monkeypatch.setattr(utility, 'route_store', store)
+    monkeypatch.setattr(utility.requests, 'get', offline)
+
+    route = utility.get_route_from_osrm(11.0, 76.96, 11.02, 77.0)
+    assert route['geometry']['coordinates'] == [[76.96, 11.0], [77.0, 11.02]]
+    assert len(store) == 0
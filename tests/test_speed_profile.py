@@ -0,0 +1,101 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import algorithms.utility as utility
+from algorithms.speed_profile import (
+    BUCKETS_PER_DAY, DEFAULT_SPEED_KMH, SpeedProfile, cell_key, time_bucket
+)
+
+RUSH_HOUR = [30.0] * BUCKETS_PER_DAY
+for bucket in range(32, 40):  # 08:00 - 10:00
+    RUSH_HOUR[bucket] = 10.0
+
+def write_profile(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+@pytest.fixture
+def profile(tmp_path):
+    profile = SpeedProfile()
+    assert profile.load(write_profile(tmp_path / 'speeds.json', {
+        'cell_size': 0.01,
+        'cells': [{'lat': 11.0, 'lng': 76.96, 'speeds': RUSH_HOUR}],
+    }))
+    return profile
+
+def test_cell_key_uses_sw_corner():
+    assert cell_key(11.0, 76.96, 0.01) == (1100, 7696)
+    assert cell_key(11.005, 76.965, 0.01) == (1100, 7696)
+    assert cell_key(10.995, 76.955, 0.01) == (1099, 7695)
+
+def test_cell_covers_points_north_east_of_corner(profile):
+    at_nine = datetime(2026, 1, 1, 9, 0)
+    assert profile.speed(11.005, 76.965, 11.005, 76.965, at_nine) == pytest.approx(10.0)
+    assert profile.speed(10.995, 76.955, 10.995, 76.955, at_nine) == DEFAULT_SPEED_KMH
+
+def test_time_bucket():
+    assert time_bucket(datetime(2026, 1, 1, 0, 0)) == 0
+    assert time_bucket(datetime(2026, 1, 1, 8, 29)) == 33
+    assert time_bucket(datetime(2026, 1, 1, 23, 59)) == BUCKETS_PER_DAY - 1
+
+def test_time_bucket_converts_aware_datetimes_to_local_time():
+    aware = datetime(2026, 1, 1, 3, 0, tzinfo=timezone(timedelta(hours=-5)))
+    assert time_bucket(aware) == time_bucket(aware.astimezone().replace(tzinfo=None))
+
+def test_default_profile_used_outside_cells(tmp_path):
+    profile = SpeedProfile()
+    assert profile.load(write_profile(tmp_path / 'speeds.json', {'default': RUSH_HOUR}))
+    assert profile.speed(12.0, 78.0, 12.1, 78.1, datetime(2026, 1, 1, 8, 30)) == pytest.approx(10.0)
+    assert profile.speed(12.0, 78.0, 12.1, 78.1, datetime(2026, 1, 1, 14, 0)) == pytest.approx(30.0)
+
+@pytest.mark.parametrize('data', [
+    {'cells': [{'lat': 11.0, 'lng': 76.96, 'speeds': 'abc'}]},
+    {'cells': [{'lat': 11.0, 'lng': 76.96, 'speeds': ['x'] * BUCKETS_PER_DAY}]},
+    {'cells': ['not a cell']},
+    {'default': [0.0] * BUCKETS_PER_DAY},
+    ['not', 'a', 'dict'],
+])
+def test_invalid_file_keeps_previous_tables(profile, tmp_path, data):
+    at_nine = datetime(2026, 1, 1, 9, 0)
+    assert not profile.load(write_profile(tmp_path / 'bad.json', data))
+    assert profile.speed(11.005, 76.965, 11.005, 76.965, at_nine) == pytest.approx(10.0)
+
+@pytest.mark.parametrize('duplicate', [
+    {'lat': 11.0, 'lng': 76.96},
+    {'lat': 11.009, 'lng': 76.961},  # Snaps to the same cell as 11.0, 76.96
+])
+def test_duplicate_cells_are_rejected(profile, tmp_path, duplicate):
+    at_nine = datetime(2026, 1, 1, 9, 0)
+    assert not profile.load(write_profile(tmp_path / 'duplicate.json', {
+        'cells': [
+            {'lat': 11.0, 'lng': 76.96, 'speeds': [20.0] * BUCKETS_PER_DAY},
+            dict(duplicate, speeds=[20.0] * BUCKETS_PER_DAY),
+            {'lat': 11.01, 'lng': 76.96, 'speeds': [50.0] * BUCKETS_PER_DAY},
+        ],
+    }))
+    assert profile.speed(11.005, 76.965, 11.005, 76.965, at_nine) == pytest.approx(10.0)
+
+def test_distinct_cells_read_their_own_speeds(tmp_path):
+    profile = SpeedProfile()
+    assert profile.load(write_profile(tmp_path / 'speeds.json', {
+        'cells': [
+            {'lat': 11.0, 'lng': 76.96, 'speeds': [20.0] * BUCKETS_PER_DAY},
+            {'lat': 11.01, 'lng': 76.96, 'speeds': [50.0] * BUCKETS_PER_DAY},
+        ],
+    }))
+    assert profile.speed(11.005, 76.965, 11.005, 76.965) == pytest.approx(20.0)
+    assert profile.speed(11.015, 76.965, 11.015, 76.965) == pytest.approx(50.0)
+
+def test_fallback_eta_uses_departure(profile, monkeypatch):
+    def offline(*args, **kwargs):
+        raise utility.requests.ConnectionError('offline')
+
+    monkeypatch.setattr(utility, 'speed_profile', profile)
+    monkeypatch.setattr(utility.route_store, 'get', lambda *args: None)
+    monkeypatch.setattr(utility.requests, 'get', offline)
+
+    rush = utility.get_route_from_osrm(11.001, 76.961, 11.009, 76.969, datetime(2026, 1, 1, 8, 30))
+    midday = utility.get_route_from_osrm(11.001, 76.961, 11.009, 76.969, datetime(2026, 1, 1, 14, 0))
+    assert rush['duration'] == pytest.approx(midday['duration'] * 3)